@@ -5,19 +5,90 @@ Supports both single file processing and batch processing of all PDFs in a direc
 """
 
 import argparse
+import hashlib
+import json
+import os
+import queue
+import shutil
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from functools import partial
+from itertools import islice, repeat
+from multiprocessing import shared_memory, util
 from pathlib import Path
-from typing import List
+from typing import Callable, Iterator, List, Optional, Sequence, TextIO, Tuple
 
 import fitz  # PyMuPDF
 import pytesseract
-from PIL import Image
-import io
+from PIL import Image, ImageChops
+
+try:
+    from tesserocr import OEM, PSM, PyTessBaseAPI
+except ImportError:
+    # tesserocr is optional; without it each page is OCR'd by a tesseract subprocess.
+    PyTessBaseAPI = None
 
 
 DEFAULT_BOOKS_DIR = "books"
 DEFAULT_OUTPUT_DIR = "output"
 
+OCR_MODES = ("auto", "force", "never")
+
+# Pages whose text layer has at least this many characters are not OCR'd in auto mode.
+TEXT_LAYER_MIN_CHARS = 50
+
+# Index in the output directory of PDFs already processed, keyed by input fingerprint.
+PROCESSED_INDEX_NAME = ".processed.json"
+
+# Number of leading bytes of a PDF hashed for its fingerprint.
+FINGERPRINT_BYTES = 1 << 20
+
+# Pages whose mean OCR word confidence (0-100) is below this are re-rendered
+# at ESCALATION_DPI and OCR'd again.
+MIN_OCR_CONFIDENCE = 70
+ESCALATION_DPI = 400
+
+# White border, in pixels, kept around page content when cropping margins.
+CROP_MARGIN = 16
+
+# Directory, next to the output files, holding OCR results keyed by page raster hash.
+OCR_CACHE_DIR_NAME = ".ocr_cache"
+
+# Tesseract settings: LSTM engine only, automatic page segmentation.
+TESSERACT_CONFIG = "--oem 1 --psm 3"
+
+# Tesseract parallelizes internally with up to ~4 threads per page, so the
+# per-page worker pool is sized to leave room for those threads.
+TESSERACT_THREADS = 4
+
+# Per-process PyMuPDF handle, opened lazily by each OCR worker.
+_worker_doc = None
+_worker_doc_path = None
+
+# Per-process view of the PDF bytes shared by the parent, set by _init_worker.
+_worker_pdf_shm = None
+_worker_pdf_data = None
+
+# Pages rendered by this process since MuPDF's resource store was last emptied.
+_pages_since_store_shrink = 0
+
+# Per-thread in-process Tesseract instances, used when tesserocr is installed.
+_tess = threading.local()
+
+# Maximum number of rendered pages waiting for OCR when pages are processed in-process.
+RENDER_QUEUE_SIZE = 4
+
+# Buffer size for the markdown output file.
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+# File in a page shard directory describing the input and settings the
+# shards were extracted with.
+SHARD_MANIFEST_NAME = "manifest.json"
+
 
 def get_pdf_files(directory: str) -> List[Path]:
     """
@@ -38,22 +109,1094 @@ def get_pdf_files(directory: str) -> List[Path]:
     return pdf_files
 
 
+def _input_fingerprint(pdf_path: Path) -> str:
+    """
+    Compute a rename-independent identifier for an input PDF.
+
+    Hashes the first FINGERPRINT_BYTES of the file together with its size,
+    which distinguishes files without reading all of a large PDF.
+
+    Args:
+        pdf_path: Path to the PDF file.
+
+    Returns:
+        Hex SHA1 digest identifying the file contents.
+    """
+    digest = hashlib.sha1()
+    with open(pdf_path, "rb") as f:
+        digest.update(f.read(FINGERPRINT_BYTES))
+    digest.update(str(pdf_path.stat().st_size).encode())
+    return digest.hexdigest()
+
+
+def _load_index(output_dir: Path) -> dict:
+    """
+    Load the index of already processed PDFs for an output directory.
+
+    Args:
+        output_dir: Path to the batch output directory.
+
+    Returns:
+        Mapping of input fingerprint to output path and input mtime, empty
+        if no readable index exists.
+    """
+    try:
+        with open(output_dir / PROCESSED_INDEX_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_index(output_dir: Path, index: dict) -> None:
+    """
+    Write the index of processed PDFs, replacing the previous one atomically.
+
+    Args:
+        output_dir: Path to the batch output directory.
+        index: Mapping of input fingerprint to output path and input mtime.
+    """
+    tmp_file = output_dir / f"{PROCESSED_INDEX_NAME}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_file, output_dir / PROCESSED_INDEX_NAME)
+
+
+def _is_processed(output_dir: Path, index: dict, key: str, pdf_path: Path) -> bool:
+    """
+    Check whether a PDF already has up-to-date output according to the index.
+
+    Args:
+        output_dir: Path to the batch output directory.
+        index: Mapping of input fingerprint to output path and input mtime.
+        key: Fingerprint of the PDF.
+        pdf_path: Path to the PDF file.
+
+    Returns:
+        True if the recorded output exists and is newer than the PDF.
+    """
+    entry = index.get(key)
+    if entry is None:
+        return False
+
+    output_file = output_dir / entry["path"]
+    if not output_file.exists():
+        return False
+
+    return output_file.stat().st_mtime >= pdf_path.stat().st_mtime
+
+
+def _mark_processed(
+    output_dir: Path,
+    index: dict,
+    key: str,
+    pdf_path: Path,
+    output_file: Path
+) -> None:
+    """
+    Record a successfully processed PDF and save the index.
+
+    Args:
+        output_dir: Path to the batch output directory.
+        index: Mapping of input fingerprint to output path and input mtime.
+        key: Fingerprint of the PDF.
+        pdf_path: Path to the PDF file.
+        output_file: Path to the markdown file written for it, stored
+            relative to the output directory.
+    """
+    index[key] = {
+        "path": output_file.name,
+        "source": pdf_path.name,
+        "mtime": pdf_path.stat().st_mtime,
+        "processed_at": time.time(),
+    }
+    _save_index(output_dir, index)
+
+
+def validate_pdf(pdf_path: Path) -> Optional[str]:
+    """
+    Check that a PDF can be opened and has pages to process.
+
+    Args:
+        pdf_path: Path to the PDF file.
+
+    Returns:
+        None if the PDF is usable, otherwise a description of the problem.
+    """
+    try:
+        doc = fitz.open(pdf_path)
+    except Exception as e:
+        return f"cannot open file ({e})"
+
+    try:
+        if doc.needs_pass:
+            return "PDF is password protected"
+        if doc.page_count == 0:
+            return "PDF has no pages"
+    finally:
+        doc.close()
+
+    return None
+
+
+def default_workers() -> int:
+    """
+    Default number of worker processes for per-page OCR or batch jobs.
+
+    Returns:
+        CPU count divided by the threads Tesseract uses per page, at least 1.
+    """
+    return max(1, (os.cpu_count() or 1) // TESSERACT_THREADS)
+
+
+def _get_worker_document(pdf_path: str) -> "fitz.Document":
+    """
+    Return this process's open handle for a PDF, opening it on first use.
+
+    Each worker keeps its own handle so MuPDF state is never shared
+    between processes. When the parent shared the PDF's bytes with the
+    pool, the handle is opened over that memory instead of the file, so
+    workers do not each read the PDF from disk; PyMuPDF releases that
+    cannot open a memoryview fall back to the file.
+
+    Args:
+        pdf_path: Path to the PDF file.
+
+    Returns:
+        The open PyMuPDF document.
+    """
+    global _worker_doc, _worker_doc_path
+
+    if _worker_doc is None or _worker_doc_path != pdf_path:
+        if _worker_doc is not None:
+            _worker_doc.close()
+        if _worker_pdf_data is not None:
+            try:
+                _worker_doc = fitz.open(stream=_worker_pdf_data, filetype="pdf")
+            except TypeError:
+                # PyMuPDF before 1.25.5 only opens bytes streams, not memoryviews.
+                _worker_doc = fitz.open(pdf_path)
+        else:
+            _worker_doc = fitz.open(pdf_path)
+        _worker_doc_path = pdf_path
+
+    return _worker_doc
+
+
+def _release_worker_pdf() -> None:
+    """
+    Close this process's document and detach it from the shared PDF bytes.
+
+    The shared memory block cannot be closed while MuPDF still references
+    it, so the document and the view over the block are released first.
+    """
+    global _worker_doc, _worker_doc_path, _worker_pdf_shm, _worker_pdf_data
+
+    if _worker_doc is not None:
+        _worker_doc.close()
+        _worker_doc = None
+        _worker_doc_path = None
+
+    _worker_pdf_data.release()
+    _worker_pdf_shm.close()
+    _worker_pdf_data = None
+    _worker_pdf_shm = None
+
+
+def _share_pdf(pdf_path: Path) -> Tuple[Optional[shared_memory.SharedMemory], int]:
+    """
+    Copy a PDF into a shared memory block for the per-page worker pool.
+
+    The file is read once by the parent; workers map the same block and
+    open the document from it, rather than each opening and reading the
+    file, which is slow on network filesystems. Shared memory is often
+    small (64 MB by default in Docker), so if the PDF does not fit the
+    workers open the file themselves instead.
+
+    Args:
+        pdf_path: Path to the PDF file.
+
+    Returns:
+        Tuple of the shared memory block, or None if the PDF could not be
+        shared, and the size of the PDF (the block may be rounded up to a
+        whole number of pages). The caller must close and unlink the block
+        once the pool has shut down.
+    """
+    size = pdf_path.stat().st_size
+    shm = None
+    try:
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        with open(pdf_path, "rb") as f:
+            f.readinto(shm.buf)
+    except BaseException as e:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+        if not isinstance(e, OSError):
+            raise
+        print(f"Could not load PDF into shared memory ({e}); workers will read it from disk")
+        return None, size
+
+    return shm, size
+
+
+def _release_render_memory(pages_per_chunk: int) -> None:
+    """
+    Empty MuPDF's resource store once every pages_per_chunk rendered pages.
+
+    MuPDF caches decoded images and fonts across pages; for scanned books
+    these are rarely reused, and without trimming the store grows with the
+    number of pages rendered.
+
+    Args:
+        pages_per_chunk: Number of rendered pages between store trims.
+    """
+    global _pages_since_store_shrink
+
+    _pages_since_store_shrink += 1
+    if _pages_since_store_shrink >= pages_per_chunk:
+        fitz.TOOLS.store_shrink(100)
+        _pages_since_store_shrink = 0
+
+
+def _data_to_text(data: dict) -> Tuple[str, Optional[float]]:
+    """
+    Rebuild page text and its mean word confidence from Tesseract word data.
+
+    Args:
+        data: Output of pytesseract.image_to_data as a dict.
+
+    Returns:
+        Tuple of the text, with words joined into lines and blank lines
+        between paragraphs, and the mean word confidence (None if no words
+        were found).
+    """
+    paragraphs = {}
+    confidences = []
+
+    for i, word in enumerate(data["text"]):
+        conf = float(data["conf"][i])
+        if conf < 0 or not word.strip():
+            continue
+
+        confidences.append(conf)
+        lines = paragraphs.setdefault((data["block_num"][i], data["par_num"][i]), {})
+        lines.setdefault(data["line_num"][i], []).append(word)
+
+    text = "\n\n".join(
+        "\n".join(" ".join(words) for words in lines.values())
+        for lines in paragraphs.values()
+    )
+    confidence = sum(confidences) / len(confidences) if confidences else None
+
+    return text, confidence
+
+
+def _init_worker(shm_name: Optional[str] = None, size: int = 0) -> None:
+    """
+    Prepare a worker process for OCR.
+
+    Creates the process's tesserocr API up front, when tesserocr is
+    installed, so each worker loads the Tesseract model exactly once for
+    all the pages or PDFs it processes. The batch pool's workers live for
+    the whole batch, but the per-page pool is created for each PDF, so
+    PDFs processed one at a time still load the model once per worker per
+    PDF. Also called lazily by each thread that runs OCR, since an API
+    instance must not be shared between threads.
+
+    Args:
+        shm_name: Name of a shared memory block holding the PDF being
+            processed, or None if workers should open the file themselves.
+        size: Size of the PDF in bytes.
+    """
+    global _worker_pdf_shm, _worker_pdf_data
+
+    if shm_name is not None and _worker_pdf_shm is None:
+        _worker_pdf_shm = shared_memory.SharedMemory(name=shm_name)
+        _worker_pdf_data = _worker_pdf_shm.buf[:size]
+        # Pool workers leave through os._exit, which skips atexit handlers;
+        # multiprocessing runs Finalize callbacks before that.
+        util.Finalize(None, _release_worker_pdf, exitpriority=0)
+
+    if PyTessBaseAPI is not None and getattr(_tess, "api", None) is None:
+        _tess.api = PyTessBaseAPI(psm=PSM.AUTO, oem=OEM.LSTM_ONLY)
+
+
+def _image_to_text(img: Image.Image) -> Tuple[str, Optional[float]]:
+    """
+    Run OCR on an image.
+
+    Uses a single in-process tesserocr API per thread when available, so the
+    Tesseract model is loaded once rather than once per page. Falls back to
+    pytesseract otherwise.
+
+    Args:
+        img: Image of the rendered page.
+
+    Returns:
+        Tuple of the recognized text and its mean word confidence (0-100),
+        or None for the confidence if no words were found.
+    """
+    if PyTessBaseAPI is None:
+        data = pytesseract.image_to_data(
+            img, config=TESSERACT_CONFIG, output_type=pytesseract.Output.DICT
+        )
+        return _data_to_text(data)
+
+    _init_worker()
+
+    _tess.api.SetImage(img)
+    text = _tess.api.GetUTF8Text()
+    confidence = _tess.api.MeanTextConf() if text.strip() else None
+
+    return text, confidence
+
+
+def _page_cache_key(pix: "fitz.Pixmap") -> str:
+    """
+    Hash a rendered page so identical pages share a cache entry.
+
+    Args:
+        pix: Rendered page pixmap.
+
+    Returns:
+        Hex digest of the pixmap dimensions and pixel data.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{pix.width}x{pix.height}x{pix.n}".encode())
+    digest.update(pix.samples_mv)
+    return digest.hexdigest()
+
+
+def _read_cached_text(cache_dir: Path, key: str) -> Optional[str]:
+    """
+    Look up previously OCR'd text for a page.
+
+    Args:
+        cache_dir: Path to the OCR cache directory.
+        key: Cache key of the rendered page.
+
+    Returns:
+        The cached text, or None if the page has not been seen before.
+    """
+    try:
+        return (cache_dir / f"{key}.txt").read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def _write_cached_text(cache_dir: Path, key: str, text: str) -> None:
+    """
+    Store OCR'd text for a page in the cache.
+
+    Entries are written to a temporary file, unique to the writing process
+    and thread, and renamed into place, so concurrent workers never see a
+    partial entry. Identical pages OCR'd at the same time produce the same
+    entry, so whichever rename lands last wins.
+
+    Args:
+        cache_dir: Path to the OCR cache directory.
+        key: Cache key of the rendered page.
+        text: Text recognized on the page.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+    tmp_file.write_text(text, encoding="utf-8")
+    try:
+        os.replace(tmp_file, cache_dir / f"{key}.txt")
+    except FileNotFoundError:
+        # The entry is only a cache; losing the write to a concurrent
+        # cleanup of the directory does not affect the page's text.
+        pass
+
+
+def _otsu_threshold(histogram: List[int]) -> int:
+    """
+    Pick the gray level that best separates ink from paper (Otsu's method).
+
+    Args:
+        histogram: 256-bin histogram of a grayscale image.
+
+    Returns:
+        Threshold gray level; pixels above it are treated as background.
+    """
+    total = sum(histogram)
+    sum_all = sum(level * count for level, count in enumerate(histogram))
+
+    sum_background = 0
+    weight_background = 0
+    best_threshold = 0
+    best_variance = 0.0
+
+    for level, count in enumerate(histogram):
+        weight_background += count
+        if weight_background == 0:
+            continue
+
+        weight_foreground = total - weight_background
+        if weight_foreground == 0:
+            break
+
+        sum_background += level * count
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_all - sum_background) / weight_foreground
+
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_variance = variance
+            best_threshold = level
+
+    return best_threshold
+
+
+def _binarize(img: Image.Image) -> Image.Image:
+    """
+    Convert a grayscale page to a 1-bit black and white image for OCR.
+
+    A clean bilevel image spares Tesseract its own binarization pass and
+    is an eighth of the size of the grayscale image.
+
+    Args:
+        img: Grayscale (mode L) page image. It is closed by this function.
+
+    Returns:
+        The page as a mode 1 image.
+    """
+    threshold = _otsu_threshold(img.histogram())
+    bilevel = img.point([0 if level <= threshold else 255 for level in range(256)], mode="1")
+    img.close()
+    return bilevel
+
+
+def _crop_to_content(img: Image.Image) -> Optional[Image.Image]:
+    """
+    Crop blank margins from a black and white page, keeping a small border.
+
+    Args:
+        img: Bilevel (mode 1) page image. It is closed if it gets cropped.
+
+    Returns:
+        The cropped image, or None if the page has no ink at all.
+    """
+    bbox = ImageChops.invert(img).getbbox()
+    if bbox is None:
+        img.close()
+        return None
+
+    left, top, right, bottom = bbox
+    bbox = (
+        max(left - CROP_MARGIN, 0),
+        max(top - CROP_MARGIN, 0),
+        min(right + CROP_MARGIN, img.width),
+        min(bottom + CROP_MARGIN, img.height),
+    )
+    if bbox == (0, 0, img.width, img.height):
+        return img
+
+    cropped = img.crop(bbox)
+    img.close()
+    return cropped
+
+
+def _render_pixmap(page: "fitz.Page", zoom: float) -> "fitz.Pixmap":
+    """
+    Render a page to a grayscale pixmap.
+
+    Args:
+        page: PyMuPDF page to render.
+        zoom: Scale factor applied when rendering the page.
+
+    Returns:
+        The rendered page.
+    """
+    # Tesseract works on grayscale, so render one byte per pixel.
+    return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+
+
+def _pixmap_to_image(pix: "fitz.Pixmap") -> Optional[Image.Image]:
+    """
+    Convert a rendered page into the image handed to Tesseract.
+
+    The page is binarized and its blank margins are cropped, so Tesseract
+    only scans the area that holds content.
+
+    Args:
+        pix: Grayscale pixmap of the page.
+
+    Returns:
+        The page as a cropped mode 1 image, or None if the page is blank.
+    """
+    img = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+    return _crop_to_content(_binarize(img))
+
+
+def _render_image(page: "fitz.Page", zoom: float) -> Optional[Image.Image]:
+    """
+    Render a page to a black and white image for OCR.
+
+    Args:
+        page: PyMuPDF page to render.
+        zoom: Scale factor applied when rendering the page.
+
+    Returns:
+        The rendered page as a cropped mode 1 image, or None if it is blank.
+    """
+    return _pixmap_to_image(_render_pixmap(page, zoom))
+
+
+def _read_text_layers(doc: "fitz.Document", ocr_mode: str = "auto") -> Optional[List[str]]:
+    """
+    Get the text of every page from the embedded text layer, if no page
+    needs OCR.
+
+    Stops at the first page without a usable text layer, so scanned PDFs
+    only pay for reading one page.
+
+    Args:
+        doc: Open PyMuPDF document.
+        ocr_mode: "auto" to require a usable text layer on every page,
+            "never" to accept whatever text layer each page has.
+
+    Returns:
+        The text of each page in order, or None if some page needs OCR.
+    """
+    texts = []
+
+    for page in doc:
+        text = page.get_text("text")
+        if ocr_mode != "never" and len(text.strip()) < TEXT_LAYER_MIN_CHARS:
+            return None
+        texts.append(text)
+
+    return texts
+
+
+def _render_page(
+    doc: "fitz.Document",
+    page_num: int,
+    zoom: float,
+    cache_dir: Optional[str] = None,
+    ocr_mode: str = "auto"
+) -> Tuple[Optional[str], Optional[str], Optional[Image.Image]]:
+    """
+    Prepare a page for OCR, or get its text directly when OCR isn't needed.
+
+    Args:
+        doc: Open PyMuPDF document.
+        page_num: Zero-based index of the page to process.
+        zoom: Scale factor applied when rendering the page.
+        cache_dir: Path to the OCR cache directory, or None to disable caching.
+        ocr_mode: "auto" to OCR only pages without a usable text layer,
+            "force" to OCR every page, "never" to only use the text layer.
+
+    Returns:
+        Tuple of the page text, cache key and image. The text is set when it
+        came from the text layer or the OCR cache, or is empty for a blank
+        page; otherwise the image needs
+        OCR and the cache key (None if caching is disabled) identifies it.
+    """
+    page = doc[page_num]
+
+    if ocr_mode != "force":
+        text = page.get_text("text")
+        if ocr_mode == "never" or len(text.strip()) >= TEXT_LAYER_MIN_CHARS:
+            return text, None, None
+
+    pix = _render_pixmap(page, zoom)
+
+    key = None
+    if cache_dir:
+        key = _page_cache_key(pix)
+        text = _read_cached_text(Path(cache_dir), key)
+        if text is not None:
+            return text, None, None
+
+    img = _pixmap_to_image(pix)
+    pix = None
+
+    if img is None:
+        return "", None, None
+
+    return None, key, img
+
+
+def _recognize_page(
+    img: Image.Image,
+    key: Optional[str],
+    cache_dir: Optional[str],
+    rerender: Optional[Callable[[], Optional[Image.Image]]] = None
+) -> str:
+    """
+    Run OCR on a rendered page and store the result in the cache.
+    The image is closed afterwards to release its pixel buffer.
+
+    If the mean word confidence is below MIN_OCR_CONFIDENCE, the page is
+    rendered again with rerender and the more confident result is kept.
+
+    Args:
+        img: Image of the rendered page.
+        key: Cache key of the page, or None if caching is disabled.
+        cache_dir: Path to the OCR cache directory, or None to disable caching.
+        rerender: Callable returning the page rendered at a higher
+            resolution (None if blank), or None to never re-render.
+
+    Returns:
+        The recognized text.
+    """
+    text, confidence = _image_to_text(img)
+    img.close()
+
+    if rerender and confidence is not None and confidence < MIN_OCR_CONFIDENCE:
+        img = rerender()
+        if img is not None:
+            retry_text, retry_confidence = _image_to_text(img)
+            img.close()
+
+            if retry_confidence is not None and retry_confidence > confidence:
+                text = retry_text
+
+    if cache_dir and key:
+        _write_cached_text(Path(cache_dir), key, text)
+
+    return text
+
+
+def _ocr_page(
+    pdf_path: str,
+    page_num: int,
+    zoom: float,
+    cache_dir: Optional[str] = None,
+    ocr_mode: str = "auto",
+    pages_per_chunk: int = 10
+) -> Tuple[int, str]:
+    """
+    Extract the text of a single page, rendering and running OCR on it
+    unless its embedded text layer can be used.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        page_num: Zero-based index of the page to process.
+        zoom: Scale factor applied when rendering the page.
+        cache_dir: Path to the OCR cache directory, or None to disable caching.
+        ocr_mode: "auto" to OCR only pages without a usable text layer,
+            "force" to OCR every page, "never" to only use the text layer.
+        pages_per_chunk: Number of pages between trims of MuPDF's store.
+
+    Returns:
+        Tuple of the page index and the extracted text.
+    """
+    doc = _get_worker_document(pdf_path)
+    text, key, img = _render_page(doc, page_num, zoom, cache_dir, ocr_mode)
+    _release_render_memory(pages_per_chunk)
+
+    if text is None:
+        escalation_zoom = ESCALATION_DPI / 72
+        rerender = None
+        if zoom < escalation_zoom:
+            rerender = lambda: _render_image(doc[page_num], escalation_zoom)
+        text = _recognize_page(img, key, cache_dir, rerender)
+
+    return page_num, text
+
+
+def _iter_pages_pipelined(
+    pdf_path: str,
+    page_nums: Sequence[int],
+    zoom: float,
+    cache_dir: Optional[str] = None,
+    ocr_mode: str = "auto",
+    pages_per_chunk: int = 10,
+    ocr_threads: int = 1
+) -> Iterator[Tuple[int, str]]:
+    """
+    Extract the text of the given pages in the current process, in order.
+
+    Pages are rendered on a background thread into a bounded queue while
+    the calling thread runs OCR, so rendering the next page overlaps with
+    OCR of the current one. With ocr_threads above 1, up to that many pages
+    are OCR'd at once on a thread pool; Tesseract does the work outside the
+    GIL, so this overlaps OCR of several pages without extra processes.
+    OCR only touches the PDF to re-render low-confidence pages, under a lock
+    shared with the renderer.
+
+    Rendering deliberately stays on one thread: PyMuPDF is not thread-safe
+    and holds the GIL while rendering, so a pool of render threads would
+    risk crashes without rendering any faster. Pages are rendered in
+    parallel by using more than one worker process instead.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        page_nums: Zero-based indexes of the pages to process.
+        zoom: Scale factor applied when rendering pages.
+        cache_dir: Path to the OCR cache directory, or None to disable caching.
+        ocr_mode: "auto" to OCR only pages without a usable text layer,
+            "force" to OCR every page, "never" to only use the text layer.
+        pages_per_chunk: Number of pages between trims of MuPDF's store
+            and reopenings of the document.
+        ocr_threads: Maximum number of pages OCR'd at the same time.
+
+    Yields:
+        Tuples of the page index and the extracted text.
+    """
+    rendered = queue.Queue(maxsize=RENDER_QUEUE_SIZE)
+    stop = threading.Event()
+    render_lock = threading.Lock()
+    escalation_zoom = ESCALATION_DPI / 72
+    doc = fitz.open(pdf_path)
+
+    def render_pages():
+        nonlocal doc
+
+        try:
+            for index, page_num in enumerate(page_nums):
+                if stop.is_set():
+                    return
+                with render_lock:
+                    # Reopen the document each chunk so state MuPDF keeps per
+                    # document does not grow with the number of pages.
+                    if index and index % pages_per_chunk == 0:
+                        doc.close()
+                        doc = fitz.open(pdf_path)
+                    result = _render_page(doc, page_num, zoom, cache_dir, ocr_mode)
+                    _release_render_memory(pages_per_chunk)
+                rendered.put((page_num, result))
+        except Exception as e:
+            rendered.put(e)
+
+    def rerender(page_num):
+        with render_lock:
+            return _render_image(doc[page_num], escalation_zoom)
+
+    def recognize(page_num, text, key, img):
+        if text is None:
+            retry = partial(rerender, page_num) if zoom < escalation_zoom else None
+            text = _recognize_page(img, key, cache_dir, retry)
+        return page_num, text
+
+    renderer = threading.Thread(target=render_pages, daemon=True)
+    renderer.start()
+
+    ocr_pool = ThreadPoolExecutor(max_workers=ocr_threads) if ocr_threads > 1 else None
+    in_flight = deque()
+
+    try:
+        for _ in range(len(page_nums)):
+            item = rendered.get()
+            if isinstance(item, Exception):
+                raise item
+
+            page_num, (text, key, img) = item
+            if ocr_pool is None:
+                yield recognize(page_num, text, key, img)
+                continue
+
+            in_flight.append(ocr_pool.submit(recognize, page_num, text, key, img))
+            if len(in_flight) >= ocr_threads:
+                yield in_flight.popleft().result()
+
+        while in_flight:
+            yield in_flight.popleft().result()
+    finally:
+        if ocr_pool:
+            for future in in_flight:
+                future.cancel()
+            ocr_pool.shutdown()
+        stop.set()
+        # Drain the queue so a renderer blocked on a full queue can exit.
+        while renderer.is_alive():
+            try:
+                rendered.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        doc.close()
+
+
+def _page_markdown(page_num: int, text: str) -> str:
+    """
+    Format the text of a page as a markdown section.
+
+    Args:
+        page_num: Zero-based index of the page.
+        text: Extracted text of the page.
+
+    Returns:
+        The page section, with its heading.
+    """
+    return f"## Page {page_num + 1}\n\n{text.strip()}\n\n"
+
+
+def _shard_path(shard_dir: Path, page_num: int) -> Path:
+    """
+    Path of the markdown shard holding a single page.
+
+    Args:
+        shard_dir: Path to the directory of page shards.
+        page_num: Zero-based index of the page.
+
+    Returns:
+        Path to the page's shard file.
+    """
+    return shard_dir / f"page_{page_num + 1:05d}.md"
+
+
+def _write_shard(shard_dir: Path, page_num: int, text: str) -> None:
+    """
+    Write the markdown for a single page to its shard file.
+
+    The shard is written to a temporary file and renamed into place, so an
+    existing shard is always complete.
+
+    Args:
+        shard_dir: Path to the directory of page shards.
+        page_num: Zero-based index of the page.
+        text: Extracted text of the page.
+    """
+    shard_file = _shard_path(shard_dir, page_num)
+    tmp_file = shard_file.with_suffix(".tmp")
+    tmp_file.write_text(_page_markdown(page_num, text), encoding="utf-8")
+    os.replace(tmp_file, shard_file)
+
+
+def _prepare_shard_dir(shard_dir: Path, manifest: dict) -> None:
+    """
+    Create the shard directory, discarding shards left by a different run.
+
+    Shards are only reused when the directory's manifest matches the
+    current input and settings; shards from another PDF with the same
+    name, from an earlier version of the PDF, or extracted with another
+    DPI or OCR mode are deleted.
+
+    Args:
+        shard_dir: Path to the directory of page shards.
+        manifest: Input fingerprint, page count and extraction settings of
+            the current run.
+    """
+    manifest_file = shard_dir / SHARD_MANIFEST_NAME
+
+    if shard_dir.exists():
+        try:
+            with open(manifest_file, encoding="utf-8") as f:
+                previous = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            previous = None
+
+        if previous == manifest:
+            return
+
+        print(f"Discarding page shards from a different input or settings in {shard_dir}")
+        shutil.rmtree(shard_dir)
+
+    shard_dir.mkdir(parents=True)
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def _ocr_page_to_shard(
+    shard_dir: str,
+    pdf_path: str,
+    page_num: int,
+    zoom: float,
+    cache_dir: Optional[str] = None,
+    ocr_mode: str = "auto",
+    pages_per_chunk: int = 10
+) -> int:
+    """
+    Extract the text of a single page and write it to its shard file.
+
+    Args:
+        shard_dir: Path to the directory of page shards.
+        pdf_path: Path to the PDF file.
+        page_num: Zero-based index of the page to process.
+        zoom: Scale factor applied when rendering the page.
+        cache_dir: Path to the OCR cache directory, or None to disable caching.
+        ocr_mode: "auto" to OCR only pages without a usable text layer,
+            "force" to OCR every page, "never" to only use the text layer.
+        pages_per_chunk: Number of pages between trims of MuPDF's store.
+
+    Returns:
+        The page index.
+    """
+    page_num, text = _ocr_page(pdf_path, page_num, zoom, cache_dir, ocr_mode, pages_per_chunk)
+    _write_shard(Path(shard_dir), page_num, text)
+    return page_num
+
+
+def _write_page_shards(
+    shard_dir: Path,
+    manifest: dict,
+    pdf_path: str,
+    total_pages: int,
+    zoom: float,
+    cache_dir: Optional[str],
+    ocr_mode: str,
+    pages_per_chunk: int,
+    executor: Optional[ProcessPoolExecutor],
+    ocr_threads: int = 1
+) -> None:
+    """
+    Extract every page that does not have a shard file yet into its shard.
+
+    Pages are written as soon as they finish, in any order, so an
+    interrupted run with the same input and settings resumes from the
+    pages already written.
+
+    Args:
+        shard_dir: Path to the directory of page shards.
+        manifest: Input fingerprint, page count and extraction settings,
+            compared with those of the shards already written.
+        pdf_path: Path to the PDF file.
+        total_pages: Number of pages in the PDF.
+        zoom: Scale factor applied when rendering pages.
+        cache_dir: Path to the OCR cache directory, or None to disable caching.
+        ocr_mode: "auto" to OCR only pages without a usable text layer,
+            "force" to OCR every page, "never" to only use the text layer.
+        pages_per_chunk: Number of pages per progress update.
+        executor: Worker pool to process pages in, or None to process them
+            in the current process.
+        ocr_threads: Maximum number of pages OCR'd at the same time when
+            processing pages in the current process.
+    """
+    _prepare_shard_dir(shard_dir, manifest)
+
+    pending = [n for n in range(total_pages) if not _shard_path(shard_dir, n).exists()]
+    done = total_pages - len(pending)
+    if done:
+        print(f"Resuming: {done} page(s) already extracted in {shard_dir}")
+
+    completed = 0
+
+    if executor:
+        futures = [
+            executor.submit(
+                _ocr_page_to_shard, str(shard_dir), pdf_path, page_num,
+                zoom, cache_dir, ocr_mode, pages_per_chunk
+            )
+            for page_num in pending
+        ]
+        try:
+            for future in as_completed(futures):
+                future.result()
+                completed += 1
+                if completed % pages_per_chunk == 0 or completed == len(pending):
+                    print(f"Extracted {done + completed} of {total_pages} pages...")
+        finally:
+            for future in futures:
+                future.cancel()
+    else:
+        pipeline = _iter_pages_pipelined(
+            pdf_path, pending, zoom, cache_dir, ocr_mode, pages_per_chunk, ocr_threads
+        )
+        try:
+            for page_num, text in pipeline:
+                _write_shard(shard_dir, page_num, text)
+                completed += 1
+                if completed % pages_per_chunk == 0 or completed == len(pending):
+                    print(f"Extracted {done + completed} of {total_pages} pages...")
+        finally:
+            pipeline.close()
+
+
+def _concatenate_shards(output_file: Path, header: str, shard_dir: Path, total_pages: int) -> None:
+    """
+    Combine page shards, in page order, into the final markdown file.
+
+    Args:
+        output_file: Path to the output markdown file.
+        header: Markdown written before the first page.
+        shard_dir: Path to the directory of page shards.
+        total_pages: Number of pages in the PDF.
+    """
+    with open(output_file, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write(header)
+
+        for page_num in range(total_pages):
+            with open(_shard_path(shard_dir, page_num), encoding="utf-8") as shard:
+                shutil.copyfileobj(shard, f, OUTPUT_BUFFER_SIZE)
+
+
+class _PrefixedOutput:
+    """
+    Text stream that forwards complete lines to another stream with a prefix.
+
+    Each line is written and flushed in one call, so lines from batch jobs
+    running in parallel do not run into each other. Blank lines, which only
+    separate sections of a single PDF's output, are dropped.
+    """
+
+    def __init__(self, stream: TextIO, prefix: str):
+        self._stream = stream
+        self._prefix = prefix
+        self._partial = ""
+
+    def write(self, text: str) -> int:
+        *lines, self._partial = (self._partial + text).split("\n")
+        lines = [f"{self._prefix}{line}\n" for line in lines if line.strip()]
+        if lines:
+            self._stream.write("".join(lines))
+            self._stream.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+def _extract_batch_job(pdf_path: str, output_file: str, **kwargs) -> None:
+    """
+    Run extract_pages_to_markdown for one PDF of a parallel batch, with each
+    line it prints prefixed by the PDF's file name.
+
+    Args:
+        pdf_path: Path to the input PDF file.
+        output_file: Path to the output markdown file.
+        **kwargs: Other keyword arguments of extract_pages_to_markdown.
+    """
+    with redirect_stdout(_PrefixedOutput(sys.stdout, f"[{Path(pdf_path).name}] ")):
+        extract_pages_to_markdown(pdf_path=pdf_path, output_file=output_file, **kwargs)
+
+
 def process_batch(
     books_dir: str,
     output_dir: str,
     pages_per_chunk: int = 10,
-    dpi: int = 300,
-    skip_existing: bool = True
+    dpi: int = 200,
+    skip_existing: bool = True,
+    batch_parallelism: Optional[int] = None,
+    use_cache: bool = True,
+    ocr_mode: str = "auto",
+    sharded: bool = False,
+    ocr_threads: int = 1,
+    workers: Optional[int] = None
 ) -> None:
     """
     Process all PDF files in the books directory.
 
+    When more than one PDF is processed at a time, each PDF runs in its own
+    worker process and OCRs its pages sequentially; otherwise PDFs are
+    processed one at a time with the per-page worker pool.
+
     Args:
         books_dir: Path to directory containing PDF files.
         output_dir: Path to directory for output markdown files.
         pages_per_chunk: Number of pages to process per progress update.
         dpi: Resolution for rendering PDF pages.
-        skip_existing: If True, skip PDFs that already have output files.
+        skip_existing: If True, skip PDFs recorded in the output directory's
+            processed index whose output is still present and newer than the
+            PDF. A PDF missing from the index whose <stem>.md output is newer
+            than it is added to the index and skipped. PDFs that cannot be
+            opened or have no pages are always skipped.
+        batch_parallelism: Number of PDFs to process at once (default: 1 if
+            workers is given, otherwise based on CPU count).
+        use_cache: If True, reuse OCR results for pages already seen anywhere
+            in the output directory.
+        ocr_mode: When to OCR pages instead of using their text layer
+            ("auto", "force" or "never").
+        sharded: If True, write each page to its own file as it finishes and
+            combine them at the end, so interrupted PDFs resume where they
+            stopped.
+        ocr_threads: When a PDF is processed by a single worker, number of
+            its pages OCR'd at the same time.
+        workers: Number of OCR worker processes per PDF when PDFs are
+            processed one at a time (default: based on CPU count). Ignored
+            when several PDFs are processed at once.
     """
     pdf_files = get_pdf_files(books_dir)
 
@@ -64,61 +1207,231 @@ def process_batch(
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
+    if batch_parallelism is None:
+        batch_parallelism = 1 if workers is not None else default_workers()
+
+    if batch_parallelism > 1 and workers is not None and workers > 1:
+        print(f"Note: ignoring {workers} workers per PDF; with several PDFs at once, "
+              "each PDF is processed by a single worker")
+
     total_books = len(pdf_files)
     print(f"Found {total_books} PDF file(s) in {books_dir}")
     print(f"Output directory: {output_dir}")
+    print(f"Processing {batch_parallelism} PDF(s) at a time")
     print("-" * 60)
 
     processed = 0
     skipped = 0
+    invalid = 0
     failed = 0
 
+    processed_index = _load_index(output_path)
+    jobs = []
+
     for index, pdf_file in enumerate(pdf_files, start=1):
         output_file = output_path / f"{pdf_file.stem}.md"
 
-        print(f"\n[{index}/{total_books}] {pdf_file.name}")
+        try:
+            key = _input_fingerprint(pdf_file)
+        except OSError as e:
+            print(f"\n[{index}/{total_books}] {pdf_file.name}")
+            print(f"  Skipping: cannot read file ({e})")
+            invalid += 1
+            continue
 
-        if skip_existing and output_file.exists():
-            print(f"  Skipping: output file already exists")
+        # Output written before the processed index existed: record it rather
+        # than OCR the PDF again, as long as it is newer than the PDF.
+        if (
+            skip_existing
+            and key not in processed_index
+            and output_file.exists()
+            and output_file.stat().st_mtime >= pdf_file.stat().st_mtime
+        ):
+            _mark_processed(output_path, processed_index, key, pdf_file, output_file)
+
+        if skip_existing and _is_processed(output_path, processed_index, key, pdf_file):
+            print(f"\n[{index}/{total_books}] {pdf_file.name}")
+            print(f"  Skipping: already processed to {output_path / processed_index[key]['path']}")
             skipped += 1
             continue
 
-        try:
-            extract_pages_to_markdown(
-                pdf_path=str(pdf_file),
-                output_file=str(output_file),
-                pages_per_chunk=pages_per_chunk,
-                dpi=dpi
-            )
-            processed += 1
-        except Exception as e:
-            print(f"  Error processing {pdf_file.name}: {e}")
-            failed += 1
+        problem = validate_pdf(pdf_file)
+        if problem:
+            print(f"\n[{index}/{total_books}] {pdf_file.name}")
+            print(f"  Skipping: {problem}")
+            invalid += 1
             continue
 
+        jobs.append((pdf_file, output_file, key))
+
+    if batch_parallelism > 1:
+        with ProcessPoolExecutor(max_workers=batch_parallelism, initializer=_init_worker) as executor:
+            futures = {
+                executor.submit(
+                    _extract_batch_job,
+                    pdf_path=str(pdf_file),
+                    output_file=str(output_file),
+                    pages_per_chunk=pages_per_chunk,
+                    dpi=dpi,
+                    workers=1,
+                    use_cache=use_cache,
+                    ocr_mode=ocr_mode,
+                    sharded=sharded,
+                    ocr_threads=ocr_threads
+                ): (pdf_file, output_file, key)
+                for pdf_file, output_file, key in jobs
+            }
+
+            for future in as_completed(futures):
+                pdf_file, output_file, key = futures[future]
+                try:
+                    future.result()
+                    _mark_processed(output_path, processed_index, key, pdf_file, output_file)
+                    processed += 1
+                    print(f"\n[{processed + failed}/{len(jobs)}] Finished: {pdf_file.name}")
+                except Exception as e:
+                    print(f"  Error processing {pdf_file.name}: {e}")
+                    failed += 1
+    else:
+        for index, (pdf_file, output_file, key) in enumerate(jobs, start=1):
+            print(f"\n[{index}/{len(jobs)}] {pdf_file.name}")
+
+            try:
+                extract_pages_to_markdown(
+                    pdf_path=str(pdf_file),
+                    output_file=str(output_file),
+                    pages_per_chunk=pages_per_chunk,
+                    dpi=dpi,
+                    workers=workers,
+                    use_cache=use_cache,
+                    ocr_mode=ocr_mode,
+                    sharded=sharded,
+                    ocr_threads=ocr_threads
+                )
+                _mark_processed(output_path, processed_index, key, pdf_file, output_file)
+                processed += 1
+            except Exception as e:
+                print(f"  Error processing {pdf_file.name}: {e}")
+                failed += 1
+                continue
+
     print("\n" + "=" * 60)
     print("Batch processing complete")
     print(f"  Processed: {processed}")
     print(f"  Skipped:   {skipped}")
+    print(f"  Invalid:   {invalid}")
     print(f"  Failed:    {failed}")
     print(f"  Total:     {total_books}")
 
 
+def _write_pages_in_chunks(
+    output_file: Path,
+    header: str,
+    pdf_path: str,
+    total_pages: int,
+    zoom: float,
+    cache_dir: Optional[str],
+    ocr_mode: str,
+    pages_per_chunk: int,
+    executor: Optional[ProcessPoolExecutor],
+    ocr_threads: int = 1
+) -> None:
+    """
+    Extract every page and write the markdown file in page order, one chunk
+    of pages at a time.
+
+    Args:
+        output_file: Path to the output markdown file.
+        header: Markdown written before the first page.
+        pdf_path: Path to the PDF file.
+        total_pages: Number of pages in the PDF.
+        zoom: Scale factor applied when rendering pages.
+        cache_dir: Path to the OCR cache directory, or None to disable caching.
+        ocr_mode: "auto" to OCR only pages without a usable text layer,
+            "force" to OCR every page, "never" to only use the text layer.
+        pages_per_chunk: Number of pages to process per progress update.
+        executor: Worker pool to process pages in, or None to process them
+            in the current process.
+        ocr_threads: Maximum number of pages OCR'd at the same time when
+            processing pages in the current process.
+    """
+    pipeline = None
+    if executor is None:
+        pipeline = _iter_pages_pipelined(
+            pdf_path, range(total_pages), zoom, cache_dir, ocr_mode, pages_per_chunk, ocr_threads
+        )
+
+    try:
+        with open(output_file, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
+            f.write(header)
+
+            chunk_buf: List[str] = []
+            start_page = 0
+
+            while start_page < total_pages:
+                end_page = min(start_page + pages_per_chunk, total_pages)
+
+                print(f"Processing pages {start_page + 1} to {end_page}...")
+
+                if executor:
+                    page_nums = range(start_page, end_page)
+                    args = (
+                        repeat(pdf_path), page_nums, repeat(zoom),
+                        repeat(cache_dir), repeat(ocr_mode), repeat(pages_per_chunk)
+                    )
+                    results = executor.map(_ocr_page, *args, chunksize=1)
+                else:
+                    results = islice(pipeline, end_page - start_page)
+
+                for page_num, text in results:
+                    chunk_buf.append(_page_markdown(page_num, text))
+
+                f.writelines(chunk_buf)
+                chunk_buf.clear()
+
+                start_page = end_page
+    finally:
+        if pipeline:
+            pipeline.close()
+
+
 def extract_pages_to_markdown(
     pdf_path: str,
     output_file: str,
     pages_per_chunk: int = 10,
-    dpi: int = 300
+    dpi: int = 200,
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+    ocr_mode: str = "auto",
+    sharded: bool = False,
+    ocr_threads: int = 1
 ) -> None:
     """
     Extract text from a PDF file using OCR and save to a single markdown file.
-    Processes in chunks for progress reporting.
+    Pages with an embedded text layer are used as-is unless OCR is forced;
+    when every page has one, no page is rendered at all.
+    Pages are rendered and OCR'd in parallel worker processes, or with
+    rendering pipelined ahead of OCR when using a single worker, and written
+    in page order, in chunks for progress reporting.
 
     Args:
         pdf_path: Path to the input PDF file.
         output_file: Path to the output markdown file.
         pages_per_chunk: Number of pages to process per progress update.
         dpi: Resolution for rendering PDF pages (higher = better quality, slower).
+            Pages OCR'd with low confidence are retried at ESCALATION_DPI.
+        workers: Number of OCR worker processes (default: based on CPU count).
+            Use 1 to process pages in the current process.
+        use_cache: If True, reuse OCR results for identical pages, cached in a
+            directory next to the output file.
+        ocr_mode: "auto" to OCR only pages without a usable text layer,
+            "force" to OCR every page, "never" to only use the text layer.
+        sharded: If True, write each page to its own file in a directory
+            named after the output file as soon as it finishes, then combine
+            them into the output file. Pages already written by an earlier,
+            interrupted run are not processed again.
+        ocr_threads: With a single worker, number of pages OCR'd at the same
+            time on threads of the current process.
     """
     pdf_path = Path(pdf_path)
     output_file = Path(output_file)
@@ -132,42 +1445,84 @@ def extract_pages_to_markdown(
     print(f"Opening PDF: {pdf_path}")
     doc = fitz.open(pdf_path)
     total_pages = len(doc)
+    texts = _read_text_layers(doc, ocr_mode) if ocr_mode != "force" else None
+    doc.close()
+
     print(f"Total pages: {total_pages}")
     print(f"Output file: {output_file}")
-    print(f"Using OCR at {dpi} DPI")
-
-    zoom = dpi / 72
-    matrix = fitz.Matrix(zoom, zoom)
-
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(f"# {pdf_path.stem}\n\n")
-        f.write(f"Extracted from: {pdf_path.name}\n\n")
-        f.write(f"Total pages: {total_pages}\n\n")
-        f.write("---\n\n")
 
-        start_page = 0
+    header = (
+        f"# {pdf_path.stem}\n\n"
+        f"Extracted from: {pdf_path.name}\n\n"
+        f"Total pages: {total_pages}\n\n"
+        "---\n\n"
+    )
 
-        while start_page < total_pages:
-            end_page = min(start_page + pages_per_chunk, total_pages)
+    # Write to a temporary file and rename it into place when complete, so
+    # a crash never leaves a partial output file that looks finished. A
+    # temporary file left by a failed run is kept until the next attempt.
+    tmp_file = output_file.with_suffix(output_file.suffix + ".tmp")
+    if tmp_file.exists():
+        tmp_file.unlink()
 
-            print(f"Processing pages {start_page + 1} to {end_page}...")
+    # Born-digital PDF: every page has a text layer, so skip rendering,
+    # OCR and the worker pool entirely.
+    if texts is not None:
+        print("Using the embedded text layer of every page; no OCR needed")
+        with open(tmp_file, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
+            f.write(header)
+            f.writelines(_page_markdown(page_num, text) for page_num, text in enumerate(texts))
+        os.replace(tmp_file, output_file)
+        print(f"\nComplete. Saved to: {output_file}")
+        return
 
-            for page_num in range(start_page, end_page):
-                page = doc[page_num]
+    if workers is None:
+        workers = default_workers()
 
-                pix = page.get_pixmap(matrix=matrix)
-                img_data = pix.tobytes("png")
-                img = Image.open(io.BytesIO(img_data))
+    print(f"Using OCR at {dpi} DPI with {workers} worker(s) (OCR mode: {ocr_mode})")
 
-                text = pytesseract.image_to_string(img)
+    zoom = dpi / 72
+    cache_dir = str(output_file.parent / OCR_CACHE_DIR_NAME) if use_cache else None
 
-                f.write(f"## Page {page_num + 1}\n\n")
-                f.write(text.strip())
-                f.write("\n\n")
+    executor = None
+    shm = None
+    if workers > 1:
+        shm, size = _share_pdf(pdf_path)
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shm.name, size) if shm else ()
+        )
 
-            start_page = end_page
+    try:
+        if sharded:
+            shard_dir = output_file.with_name(output_file.name + ".pages")
+            manifest = {
+                "fingerprint": _input_fingerprint(pdf_path),
+                "total_pages": total_pages,
+                "dpi": dpi,
+                "ocr_mode": ocr_mode,
+            }
+            _write_page_shards(
+                shard_dir, manifest, str(pdf_path), total_pages, zoom,
+                cache_dir, ocr_mode, pages_per_chunk, executor, ocr_threads
+            )
+            _concatenate_shards(tmp_file, header, shard_dir, total_pages)
+        else:
+            _write_pages_in_chunks(
+                tmp_file, header, str(pdf_path), total_pages, zoom,
+                cache_dir, ocr_mode, pages_per_chunk, executor, ocr_threads
+            )
+    finally:
+        if executor:
+            executor.shutdown()
+        if shm:
+            shm.close()
+            shm.unlink()
 
-    doc.close()
+    os.replace(tmp_file, output_file)
+    if sharded:
+        shutil.rmtree(shard_dir)
 
     print(f"\nComplete. Saved to: {output_file}")
 
@@ -207,13 +1562,53 @@ def main():
     parser.add_argument(
         "-d", "--dpi",
         type=int,
-        default=300,
-        help="DPI for rendering pages (default: 300, higher = better quality but slower)"
+        default=200,
+        help=f"DPI for rendering pages (default: 200, higher = better quality but slower; "
+             f"low-confidence pages are retried at {ESCALATION_DPI})"
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=None,
+        help="Number of OCR worker processes per PDF; in batch mode, only used when one PDF is "
+             "processed at a time (default: CPU count / 4, minimum 1)"
+    )
+    parser.add_argument(
+        "--ocr-threads",
+        type=int,
+        default=1,
+        help="With a single worker (-w 1, or parallel batch jobs), number of pages OCR'd at once "
+             "on threads of that process (default: 1)"
     )
     parser.add_argument(
         "--no-skip",
         action="store_true",
-        help="In batch mode, reprocess PDFs even if output file already exists"
+        help="In batch mode, reprocess PDFs even if they were already processed"
+    )
+    parser.add_argument(
+        "--batch-parallelism",
+        type=int,
+        default=None,
+        help="In batch mode, number of PDFs to process at once (default: 1 if -w is given, "
+             "otherwise CPU count / 4, minimum 1)"
+    )
+    parser.add_argument(
+        "--ocr-mode",
+        choices=OCR_MODES,
+        default="auto",
+        help="auto: OCR only pages without an embedded text layer; force: OCR every page; "
+             "never: only use the embedded text layer (default: auto)"
+    )
+    parser.add_argument(
+        "--sharded",
+        action="store_true",
+        help="Write each page to <output file>.pages/page_NNNNN.md as it finishes and combine them "
+             "at the end; rerunning after an interruption resumes from the pages already written"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Do not reuse or store OCR results for repeated pages (cache: <output dir>/{OCR_CACHE_DIR_NAME})"
     )
 
     args = parser.parse_args()
@@ -225,7 +1620,13 @@ def main():
             output_dir=output_dir,
             pages_per_chunk=args.pages_per_chunk,
             dpi=args.dpi,
-            skip_existing=not args.no_skip
+            skip_existing=not args.no_skip,
+            batch_parallelism=args.batch_parallelism,
+            use_cache=not args.no_cache,
+            ocr_mode=args.ocr_mode,
+            sharded=args.sharded,
+            ocr_threads=args.ocr_threads,
+            workers=args.workers
         )
     else:
         if args.pdf_path is None:
@@ -241,7 +1642,12 @@ def main():
             pdf_path=args.pdf_path,
             output_file=output_file,
             pages_per_chunk=args.pages_per_chunk,
-            dpi=args.dpi
+            dpi=args.dpi,
+            workers=args.workers,
+            use_cache=not args.no_cache,
+            ocr_mode=args.ocr_mode,
+            sharded=args.sharded,
+            ocr_threads=args.ocr_threads
         )
 
 